@@ -1,5 +1,56 @@
+import hashlib
 import streamlit as st
 import pandas as pd
+import altair as alt
+
+from pipeline import (
+    SOURCE_COL,
+    TOTAL_SEGMENT,
+    MAX_SEGMENTS,
+    FORECAST_HORIZON,
+    load_files,
+    clean_data,
+    detect_column_roles,
+    assess_quality,
+    build_kpi_panel,
+    detect_anomalies,
+    forecast_panel,
+    list_snapshots,
+    load_snapshot,
+    snapshot_is_current,
+)
+
+UPLOAD_MODE = "Upload File"
+SNAPSHOT_MODE = "Snapshot Siap Pakai"
+
+
+def snapshot_label(meta):
+    # status kesegaran: sumber hilang/berubah sejak diproses ditandai ⚠️
+    sources = ", ".join(s["file"] for s in meta["sources"])
+    freshness = "" if snapshot_is_current(meta) else " ⚠️ sumber hilang/berubah"
+    mode = f" [{meta['mode']}]" if meta.get("mode") else ""
+    return f"{meta['name']}{mode} — diproses {meta['created_at']} — {sources}{freshness}"
+
+
+def upload_key(uploaded_file):
+    # file_id unik per upload; fallback ke hash isi file
+    file_id = getattr(uploaded_file, "file_id", None)
+    if file_id is None:
+        file_id = hashlib.md5(uploaded_file.getvalue()).hexdigest()
+    return uploaded_file.name, file_id
+
+
+@st.cache_data(show_spinner="Membaca file...", max_entries=5)
+def load_uploads(upload_keys, _uploaded_files):
+    # parsing hanya saat file berubah, bukan di setiap rerun (ganti KPI/segmen/scope)
+    return load_files(_uploaded_files)
+
+
+@st.cache_data(show_spinner=False)
+def open_snapshot(name, created_at):
+    # created_at ikut jadi kunci cache: snapshot yang diperbarui dibaca ulang
+    return load_snapshot(name)
+
 
 st.set_page_config(
     page_title="Enterprise Data Insight",
@@ -9,59 +60,75 @@ st.set_page_config(
 st.title("📊 Enterprise Data Insight")
 st.subheader("Step 1 — Upload & Data Ingestion (Enterprise-Grade)")
 
-uploaded_file = st.file_uploader(
-    "Upload file CSV atau Excel perusahaan",
-    type=["csv", "xlsx"]
-)
+snapshot = None
+snapshot_metas = list_snapshots()
+source_mode = UPLOAD_MODE
 
-df = None
-read_error = None
-
-if uploaded_file:
-    try:
-        # ===============================
-        # CSV HANDLING (ROBUST)
-        # ===============================
-        if uploaded_file.name.lower().endswith(".csv"):
-            try:
-                df = pd.read_csv(
-                    uploaded_file,
-                    encoding="utf-8",
-                    sep=",",
-                    quotechar='"',
-                    skipinitialspace=True
-                )
-            except UnicodeDecodeError:
-                df = pd.read_csv(
-                    uploaded_file,
-                    encoding="latin1",
-                    sep=",",
-                    quotechar='"',
-                    skipinitialspace=True,
-                    engine="python"
-                )
-
-        # ===============================
-        # EXCEL HANDLING (SAFE)
-        # ===============================
-        else:
-            df = pd.read_excel(
-                uploaded_file,
-                engine="openpyxl"
-            )
+if snapshot_metas:
+    source_mode = st.radio(
+        "Sumber Data",
+        [UPLOAD_MODE, SNAPSHOT_MODE],
+        horizontal=True
+    )
+
+if source_mode == SNAPSHOT_MODE:
+    # ===============================
+    # SNAPSHOT HASIL PRECOMPUTE (watcher.py)
+    # ===============================
+    snapshot_meta = st.selectbox(
+        "📦 Pilih Snapshot",
+        snapshot_metas,
+        format_func=snapshot_label
+    )
+    snapshot = open_snapshot(snapshot_meta["name"], snapshot_meta["created_at"])
 
-    except Exception as e:
-        read_error = str(e)
+    df = snapshot["raw_data"]
+    schema_df = snapshot["schema"]
+    read_errors = snapshot["read_errors"]
+    notices = snapshot.get("notices", [])
+    file_size = snapshot_meta["size"]
+
+else:
+    uploaded_files = st.file_uploader(
+        "Upload file CSV atau Excel perusahaan (bisa lebih dari satu file)",
+        type=["csv", "xlsx"],
+        accept_multiple_files=True
+    )
+
+    df, schema_df, read_errors, notices = None, None, {}, []
+    file_size = sum(f.size for f in uploaded_files)
+
+    if uploaded_files:
+        df, schema_df, read_errors, notices = load_uploads(
+            tuple(upload_key(f) for f in uploaded_files), uploaded_files
+        )
 
 # ===============================
 # FEEDBACK KE USER
 # ===============================
-if read_error:
-    st.error("❌ File gagal dibaca")
-    st.code(read_error)
+for name, error in read_errors.items():
+    st.error(f"❌ File gagal dibaca: {name}")
+    st.code(error)
+
+for notice in notices:
+    st.warning(f"⚠️ {notice}")
+
+if df is not None:
+    if snapshot is not None:
+        st.success("✅ Snapshot dibuka tanpa upload & pemrosesan ulang")
+    else:
+        st.success("✅ Data berhasil diupload & dibaca dengan aman")
+
+    if schema_df is not None:
+        st.info(
+            f"{len(schema_df.columns)} file digabung menjadi satu dataset. "
+            f"Nama kolom diselaraskan dan asal data dicatat di kolom '{SOURCE_COL}'."
+        )
 
-elif df is not None:
-    st.success("✅ Data berhasil diupload & dibaca dengan aman")
+        partial_cols = schema_df[~schema_df.all(axis=1)]
+        if not partial_cols.empty:
+            with st.expander(f"Kolom yang tidak ada di semua file ({len(partial_cols)})"):
+                st.dataframe(partial_cols, use_container_width=True)
 
     # ===============================
     # PREVIEW DATA (EXCEL-LIKE)
@@ -82,7 +149,7 @@ elif df is not None:
     with c3:
         st.metric("Total Missing", df.isnull().sum().sum())
     with c4:
-        st.metric("Ukuran File (KB)", round(uploaded_file.size / 1024, 2))
+        st.metric("Ukuran File (KB)", round(file_size / 1024, 2))
 
     # ===============================
     # STRUKTUR KOLOM
@@ -117,115 +184,10 @@ elif df is not None:
 
     st.subheader("Step 2 — Financial-Grade Data Cleaning & Normalization")
 
-    df_clean = df.copy()
-    cleaning_log = []
-    
-    # ======================================================
-    # 1️⃣ NORMALISASI NAMA KOLOM
-    # ======================================================
-    original_columns = df_clean.columns.tolist()
-    
-    df_clean.columns = (
-        df_clean.columns
-        .astype(str)
-        .str.strip()
-        .str.lower()
-        .str.replace(r"[^\w\s]", "", regex=True)
-        .str.replace(r"\s+", "_", regex=True)
-    )
-    
-    if original_columns != df_clean.columns.tolist():
-        cleaning_log.append(
-            "Nama kolom dinormalisasi (lowercase, underscore, tanpa simbol)"
-        )
-    
-    # ======================================================
-    # 2️⃣ HAPUS DUPLIKASI BARIS (AMAN)
-    # ======================================================
-    before_rows = df_clean.shape[0]
-    df_clean = df_clean.drop_duplicates()
-    after_rows = df_clean.shape[0]
-    
-    if before_rows != after_rows:
-        cleaning_log.append(
-            f"{before_rows - after_rows} baris duplikat dihapus"
-        )
-    
-    # ======================================================
-    # 3️⃣ NORMALISASI ISI DATA (FINANCE-AWARE)
-    # ======================================================
-    for col in df_clean.columns:
-    
-        # =========================
-        # A. OBJECT / STRING
-        # =========================
-        if df_clean[col].dtype == "object":
-    
-            original_non_null = df_clean[col].notna().sum()
-    
-            # string dasar (AMAN)
-            series = (
-                df_clean[col]
-                .astype(str)
-                .str.strip()
-                .str.replace(r"\s+", " ", regex=True)
-            )
-    
-            # -------------------------
-            # Coba konversi DATETIME
-            # -------------------------
-            converted_date = pd.to_datetime(series, errors="coerce")
-            if converted_date.notna().mean() > 0.8:
-                df_clean[col] = converted_date
-                cleaning_log.append(
-                    f"Kolom '{col}' dikonversi ke datetime"
-                )
-                continue
-    
-            # -------------------------
-            # Normalisasi ANGKA KEUANGAN
-            # -------------------------
-            numeric_candidate = (
-                series
-                .str.replace(r"[^\d\-,.]", "", regex=True)  # hapus currency symbol
-                .str.replace(",", "", regex=False)          # hapus ribuan
-                .replace({"": None, "-": None})
-            )
-    
-            numeric_converted = pd.to_numeric(
-                numeric_candidate, errors="coerce"
-            )
-    
-            # konversi hanya jika mayoritas valid
-            if numeric_converted.notna().mean() > 0.6:
-                df_clean[col] = numeric_converted
-                cleaning_log.append(
-                    f"Kolom '{col}' dinormalisasi sebagai numerik (financial)"
-                )
-                continue
-    
-            # fallback → tetap string
-            df_clean[col] = series
-    
-        # =========================
-        # B. IMPUTASI MISSING VALUE
-        # =========================
-        missing = df_clean[col].isnull().sum()
-    
-        if missing > 0:
-            if pd.api.types.is_numeric_dtype(df_clean[col]):
-                median = df_clean[col].median()
-                df_clean[col] = df_clean[col].fillna(median)
-                cleaning_log.append(
-                    f"Kolom '{col}' (numerik): {missing} missing → median"
-                )
-            else:
-                mode = df_clean[col].mode()
-                fill_value = mode[0] if not mode.empty else "Unknown"
-                df_clean[col] = df_clean[col].fillna(fill_value)
-                cleaning_log.append(
-                    f"Kolom '{col}' (kategori): {missing} missing → '{fill_value}'"
-                )
+    if snapshot is not None:
+        df_clean, cleaning_log = snapshot["clean_data"], snapshot["cleaning_log"]
+    else:
+        df_clean, cleaning_log = clean_data(df, schema_df)
     
     # ======================================================
     # 4️⃣ RINGKASAN HASIL
@@ -276,25 +238,35 @@ elif df is not None:
     # ======================================================
     st.session_state["clean_data"] = df_clean
     
+    # ======================================================
+    # CAKUPAN ANALISIS (KONSOLIDASI / PER SUMBER)
+    # ======================================================
+    df_scope = df_clean
+    
+    if SOURCE_COL in df_clean.columns:
+        sources = df_clean[SOURCE_COL].unique().tolist()
+        scope = st.selectbox(
+            "🏢 Cakupan Analisis Step 3–8",
+            ["Semua File (Konsolidasi)"] + sources
+        )
+        if scope in sources:
+            df_scope = df_clean[df_clean[SOURCE_COL] == scope]
+    
+    st.session_state["scope_data"] = df_scope
+    
         
             
     st.subheader("Step 3 — Data Readiness & Quality Gate (Enterprise Standard)")
     
-    df_analysis = st.session_state.get("clean_data", df_clean).copy()
-    total_rows = len(df_analysis)
+    df_analysis = st.session_state.get("scope_data", df_scope).copy()
+    
+    # snapshot hanya berlaku untuk data konsolidasi penuh
+    use_snapshot = snapshot is not None and df_scope is df_clean
     
     # ======================================================
     # 1️⃣ DETEKSI PERAN KOLOM (POST-CLEAN)
     # ======================================================
-    date_cols, numeric_cols, categorical_cols = [], [], []
-    
-    for col in df_analysis.columns:
-        if pd.api.types.is_datetime64_any_dtype(df_analysis[col]):
-            date_cols.append(col)
-        elif pd.api.types.is_numeric_dtype(df_analysis[col]) and not pd.api.types.is_bool_dtype(df_analysis[col]):
-            numeric_cols.append(col)
-        else:
-            categorical_cols.append(col)
+    date_cols, numeric_cols, categorical_cols = detect_column_roles(df_analysis)
     
     st.markdown("### Struktur Data Setelah Cleaning")
     
@@ -314,27 +286,10 @@ elif df is not None:
     # ======================================================
     # 2️⃣ DATA QUALITY ASSESSMENT (BUSINESS-ORIENTED)
     # ======================================================
-    quality_table = []
-    
-    for col in df_analysis.columns:
-        missing_rate = df_analysis[col].isnull().mean()
-        unique_ratio = df_analysis[col].nunique(dropna=True) / total_rows
-    
-        status = "Aman"
-    
-        if missing_rate > 0.30:
-            status = "Missing Tinggi"
-        elif unique_ratio < 0.05 and col in categorical_cols:
-            status = "Variasi Rendah"
-    
-        quality_table.append({
-            "Kolom": col,
-            "Missing (%)": round(missing_rate * 100, 2),
-            "Unique Ratio": round(unique_ratio, 3),
-            "Status": status
-        })
-    
-    quality_df = pd.DataFrame(quality_table)
+    if use_snapshot:
+        quality_df = snapshot["quality"]
+    else:
+        quality_df = assess_quality(df_analysis, categorical_cols)
     
     st.markdown("### Indikator Kualitas Data")
     
@@ -404,7 +359,7 @@ elif df is not None:
     
     st.subheader("Step 4 — Financial Performance Overview")
 
-    df_analysis = st.session_state.get("clean_data", df_clean).copy()
+    df_analysis = st.session_state.get("scope_data", df_scope).copy()
     
     # ===============================
     # 1️⃣ DETEKSI STRUKTUR DATA
@@ -419,7 +374,13 @@ elif df is not None:
     # ===============================
     # 2️⃣ PILIH KPI UTAMA
     # ===============================
-    c1, c2 = st.columns(2)
+    segment_cols = [
+        c for c in df_analysis.columns
+        if c not in date_cols and c not in numeric_cols
+        and 1 < df_analysis[c].nunique() <= MAX_SEGMENTS
+    ]
+    
+    c1, c2, c3 = st.columns(3)
     
     with c1:
         date_col = st.selectbox("📅 Periode Waktu", date_cols)
@@ -427,6 +388,13 @@ elif df is not None:
     with c2:
         kpi_col = st.selectbox("💰 KPI Finansial", numeric_cols)
     
+    with c3:
+        segment_col = st.selectbox(
+            "🏷 Segmen (Early Warning)",
+            [None] + segment_cols,
+            format_func=lambda c: "Tanpa Segmen" if c is None else c
+        )
+    
     # ===============================
     # 3️⃣ AGREGASI DATA (RAMAH AWAM)
     # ===============================
@@ -464,11 +432,55 @@ elif df is not None:
     # ===============================
     st.markdown("### 📈 Pergerakan KPI dari Waktu ke Waktu")
     
-    st.line_chart(
-        df_trend.set_index("period")[kpi_col],
-        use_container_width=True
+    # anomali dihitung sekali untuk semua KPI & segmen (dipakai lagi di Step 7)
+    if use_snapshot and segment_col is None and date_col in snapshot["kpi_panels"]:
+        kpi_panel = snapshot["kpi_panels"][date_col]
+    else:
+        kpi_panel = build_kpi_panel(df_analysis, date_col, numeric_cols, segment_col)
+    anomalies = detect_anomalies(kpi_panel)
+    
+    kpi_anomalies = anomalies[
+        (anomalies["KPI"] == kpi_col) & (anomalies["Segmen"] == TOTAL_SEGMENT)
+    ]
+    chart_flags = (
+        kpi_anomalies
+        .groupby("Periode")
+        .agg(
+            Nilai=("Nilai", "first"),
+            Metode=("Metode", ", ".join),
+            Arah=("Arah", "first")
+        )
+        .reset_index()
+    )
+    
+    chart = (
+        alt.Chart(df_trend)
+        .mark_line()
+        .encode(
+            x=alt.X("period:T", title="Periode"),
+            y=alt.Y(f"{kpi_col}:Q", title=kpi_col)
+        )
     )
     
+    if not chart_flags.empty:
+        chart += (
+            alt.Chart(chart_flags)
+            .mark_point(color="red", size=100, filled=True)
+            .encode(
+                x="Periode:T",
+                y="Nilai:Q",
+                tooltip=["Periode:T", "Nilai:Q", "Arah:N", "Metode:N"]
+            )
+        )
+    
+    st.altair_chart(chart, use_container_width=True)
+    
+    if not chart_flags.empty:
+        st.caption(
+            f"🔴 {len(chart_flags)} periode ditandai sebagai anomali "
+            "(lonjakan/penurunan tidak wajar) — detail di Step 7."
+        )
+    
     st.subheader("Step 5 — Executive Financial Insight")
     
     insights = []
@@ -506,6 +518,39 @@ elif df is not None:
             "Fokuskan strategi pada efisiensi dan optimasi operasional."
         )
     
+    # ===============================
+    # PROYEKSI KUARTAL BERIKUTNYA (BATCH SEMUA KPI & SEGMEN)
+    # ===============================
+    forecast, forecast_lower, forecast_upper, forecast_summary = forecast_panel(kpi_panel)
+    
+    kpi_key = (kpi_col, TOTAL_SEGMENT)
+    kpi_forecast = forecast_summary.loc[kpi_key]
+    projected_growth = kpi_forecast["Growth Proyeksi (%)"]
+    
+    # riwayat < FORECAST_HORIZON periode → tanpa growth proyeksi, semua aturan proyeksi dilewati
+    has_projection = pd.notna(projected_growth)
+    
+    if not has_projection:
+        pass
+    elif projected_growth > 5:
+        insights.append(
+            f"{kpi_col} diproyeksikan naik sekitar {projected_growth:.1f}% pada kuartal berikutnya."
+        )
+        recommendations.append(
+            "Siapkan kapasitas operasional dan persediaan untuk mengantisipasi kenaikan permintaan."
+        )
+    elif projected_growth < -5:
+        insights.append(
+            f"{kpi_col} diproyeksikan turun sekitar {abs(projected_growth):.1f}% pada kuartal berikutnya."
+        )
+        recommendations.append(
+            "Antisipasi penurunan dengan menahan biaya yang tidak mendesak dan memperkuat penjualan."
+        )
+    else:
+        insights.append(
+            f"{kpi_col} diproyeksikan relatif stabil pada kuartal berikutnya."
+        )
+    
     # ===============================
     # TAMPILKAN DALAM BAHASA EKSEKUTIF
     # ===============================
@@ -519,9 +564,65 @@ elif df is not None:
     for i, text in enumerate(recommendations, 1):
         st.write(f"{i}. {text}")
     
+    st.markdown(f"### 🔮 Proyeksi {FORECAST_HORIZON} Bulan ke Depan")
+    
+    c1, c2, c3 = st.columns(3)
+    c1.metric(
+        "Proyeksi Total",
+        f"{kpi_forecast[f'Proyeksi {FORECAST_HORIZON} Periode']:,.0f}",
+        f"{projected_growth:.1f}%" if has_projection else None
+    )
+    c2.metric(
+        "Rentang (≈80%)",
+        f"{kpi_forecast['Batas Bawah']:,.0f} – {kpi_forecast['Batas Atas']:,.0f}"
+    )
+    c3.metric("Model Terpilih", kpi_forecast["Model"])
+    
+    if not has_projection:
+        st.info(
+            f"Riwayat data kurang dari {FORECAST_HORIZON} bulan, sehingga growth proyeksi "
+            "belum dipakai dalam penilaian dan rekomendasi."
+        )
+    
+    df_projection = pd.DataFrame({
+        "period": forecast.index,
+        kpi_col: forecast[kpi_key].values,
+        "lower": forecast_lower[kpi_key].values,
+        "upper": forecast_upper[kpi_key].values,
+    })
+    
+    history_line = (
+        alt.Chart(df_trend)
+        .mark_line()
+        .encode(
+            x=alt.X("period:T", title="Periode"),
+            y=alt.Y(f"{kpi_col}:Q", title=kpi_col)
+        )
+    )
+    projection_band = (
+        alt.Chart(df_projection)
+        .mark_area(opacity=0.25, color="orange")
+        .encode(x="period:T", y="lower:Q", y2="upper:Q")
+    )
+    projection_line = (
+        alt.Chart(df_projection)
+        .mark_line(color="orange", strokeDash=[6, 4], point=True)
+        .encode(x="period:T", y=f"{kpi_col}:Q")
+    )
+    
+    st.altair_chart(history_line + projection_band + projection_line, use_container_width=True)
+    
+    with st.expander("Proyeksi seluruh KPI & segmen"):
+        st.dataframe(
+            forecast_summary.rename_axis(["KPI", "Segmen"]).reset_index(),
+            use_container_width=True
+        )
+    
     st.caption(
         "Insight ini disusun otomatis dari data historis dan bertujuan membantu "
-        "manajemen memahami kondisi keuangan secara cepat dan sederhana."
+        "manajemen memahami kondisi keuangan secara cepat dan sederhana. "
+        "Proyeksi memakai model sederhana (seasonal naive, exponential smoothing, "
+        "atau tren linier) yang dipilih otomatis berdasarkan akurasi historis."
     )
     
         
@@ -572,6 +673,14 @@ elif df is not None:
     elif volatility_ratio > 0.25:
         health_score -= 15
     
+    # penalti proyeksi kuartal berikutnya
+    if not has_projection:
+        pass
+    elif projected_growth < -5:
+        health_score -= 15
+    elif projected_growth < 0:
+        health_score -= 5
+    
     health_score = max(40, health_score)
     
     # ===============================
@@ -622,12 +731,20 @@ elif df is not None:
     else:
         summary.append("Pendapatan menunjukkan kestabilan yang baik.")
     
+    if not has_projection:
+        pass
+    elif projected_growth < -5:
+        summary.append("Proyeksi kuartal berikutnya menunjukkan potensi penurunan pendapatan.")
+    elif projected_growth > 5:
+        summary.append("Proyeksi kuartal berikutnya menunjukkan potensi pertumbuhan lanjutan.")
+    
     for s in summary:
         st.write("•", s)
     
     st.caption(
         "Kesimpulan eksekutif disusun berdasarkan kombinasi "
-        "tren pertumbuhan (growth) dan tingkat stabilitas (volatilitas) pendapatan"
+        "tren pertumbuhan (growth), tingkat stabilitas (volatilitas) pendapatan, "
+        "dan proyeksi kuartal berikutnya"
     )
 
     st.subheader("Step 7 — Financial Risk Early Warning")
@@ -664,7 +781,44 @@ elif df is not None:
         )
     
     # ===============================
-    # 4️⃣ OUTPUT KE EKSEKUTIF
+    # 4️⃣ RISIKO ANOMALI MENDADAK (ROLLING WINDOW)
+    # ===============================
+    recent_periods = kpi_panel.index[-3:]
+    is_recent = kpi_anomalies["Periode"].isin(recent_periods)
+    recent_drops = kpi_anomalies[is_recent & (kpi_anomalies["Arah"] == "Penurunan")]
+    recent_spikes = kpi_anomalies[is_recent & (kpi_anomalies["Arah"] == "Lonjakan")]
+    mid_periods = kpi_anomalies.loc[~is_recent, "Periode"].nunique()
+    
+    if not recent_drops.empty:
+        risk_alerts.append(
+            f"Terdeteksi penurunan {kpi_col} yang tidak wajar pada periode terakhir "
+            f"({recent_drops['Periode'].max():%b %Y}). Perlu ditelusuri penyebabnya."
+        )
+    
+    if not recent_spikes.empty:
+        risk_alerts.append(
+            f"Terdeteksi lonjakan {kpi_col} yang tidak wajar pada periode terakhir "
+            f"({recent_spikes['Periode'].max():%b %Y}). Pastikan bukan transaksi satu kali "
+            "atau kesalahan input sebelum dijadikan dasar target."
+        )
+    
+    if mid_periods > 0:
+        risk_alerts.append(
+            f"{kpi_col} mengalami {mid_periods} periode lonjakan/penurunan "
+            "mendadak di tengah periode analisis, meskipun tren keseluruhan tampak wajar."
+        )
+    
+    # ===============================
+    # 5️⃣ RISIKO PROYEKSI KUARTAL BERIKUTNYA
+    # ===============================
+    if has_projection and projected_growth < -5:
+        risk_alerts.append(
+            f"Proyeksi {FORECAST_HORIZON} bulan ke depan menunjukkan penurunan {kpi_col} "
+            f"sekitar {abs(projected_growth):.1f}% dibanding {FORECAST_HORIZON} bulan terakhir."
+        )
+    
+    # ===============================
+    # 6️⃣ OUTPUT KE EKSEKUTIF
     # ===============================
     if not risk_alerts:
         st.success(
@@ -676,6 +830,17 @@ elif df is not None:
         for r in risk_alerts:
             st.write("•", r)
     
+    with st.expander("Detail anomali seluruh KPI & segmen"):
+        n_series = kpi_panel.shape[1]
+        n_flagged = anomalies[["KPI", "Segmen"]].drop_duplicates().shape[0]
+    
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Seri Dianalisis", n_series)
+        c2.metric("Seri dengan Anomali", n_flagged)
+        c3.metric("Periode Ditandai", len(anomalies))
+    
+        st.dataframe(anomalies, use_container_width=True)
+    
     st.caption(
         "Early warning ini bersifat indikatif dan bertujuan membantu manajemen "
         "mengenali potensi risiko sebelum berdampak lebih besar."
@@ -700,7 +865,13 @@ elif df is not None:
             "pada fluktuasi jangka pendek."
         )
     
-    if growth_pct > 5 and volatility_ratio < 0.25:
+    if has_projection and projected_growth < -5:
+        actions.append(
+            "Siapkan rencana kontinjensi kuartal berikutnya: tunda belanja modal yang tidak mendesak "
+            "dan jaga likuiditas untuk menghadapi proyeksi penurunan pendapatan."
+        )
+    
+    if growth_pct > 5 and volatility_ratio < 0.25 and not (has_projection and projected_growth < 0):
         actions.append(
             "Kondisi keuangan cukup sehat untuk mendorong ekspansi atau peningkatan kapasitas bisnis."
         )
@@ -719,7 +890,7 @@ elif df is not None:
         st.write(f"{i}. {act}")
     
     st.caption(
-        "Rekomendasi ini disusun berdasarkan pola kinerja historis "
+        "Rekomendasi ini disusun berdasarkan pola kinerja historis serta proyeksi kuartal berikutnya, "
         "dan ditujukan sebagai panduan awal dalam pengambilan keputusan manajerial."
     )
     
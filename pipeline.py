@@ -0,0 +1,802 @@
+"""Pipeline pemrosesan data Enterprise Data Insight (tanpa UI).
+
+Dipakai oleh aplikasi Streamlit (`app.py`) dan oleh layanan precompute
+(`watcher.py`) agar hasil keduanya identik.
+"""
+import io
+import os
+import multiprocessing
+import json
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SOURCE_COL = "source_file"
+MAX_READ_WORKERS = 8
+
+TOTAL_SEGMENT = "Total"
+MAX_SEGMENTS = 500
+ANOMALY_WINDOW = 6
+ANOMALY_THRESHOLD = 3.5
+SEASON_LENGTH = 12
+FORECAST_HORIZON = 3
+FORECAST_ALPHAS = (0.2, 0.4, 0.6, 0.8)
+FORECAST_BAND_Z = 1.28
+
+SNAPSHOT_DIR = os.environ.get("EDI_SNAPSHOT_DIR", "snapshots")
+
+
+def normalize_columns(columns):
+    """Normalisasi nama kolom: lowercase, underscore, tanpa simbol."""
+    return (
+        pd.Index(columns)
+        .astype(str)
+        .str.strip()
+        .str.lower()
+        .str.replace(r"[^\w\s]", "", regex=True)
+        .str.replace(r"\s+", "_", regex=True)
+    )
+
+
+def read_data_file(source):
+    """Baca satu file CSV/Excel (upload Streamlit atau path) menjadi DataFrame."""
+    # ===============================
+    # CSV HANDLING (ROBUST)
+    # ===============================
+    if str(source.name).lower().endswith(".csv"):
+        try:
+            return pd.read_csv(
+                source,
+                encoding="utf-8",
+                sep=",",
+                quotechar='"',
+                skipinitialspace=True
+            )
+        except UnicodeDecodeError:
+            if hasattr(source, "seek"):
+                source.seek(0)
+            return pd.read_csv(
+                source,
+                encoding="latin1",
+                sep=",",
+                quotechar='"',
+                skipinitialspace=True,
+                engine="python"
+            )
+
+    # ===============================
+    # EXCEL HANDLING (SAFE)
+    # ===============================
+    return pd.read_excel(
+        source,
+        engine="openpyxl"
+    )
+
+
+def make_unique(labels):
+    """Beri akhiran `_2`, `_3`, ... pada label kembar (label pertama tetap)."""
+    seen = set()
+    result = []
+
+    for label in labels:
+        candidate, n = label, 1
+        while candidate in seen:
+            n += 1
+            candidate = f"{label}_{n}"
+        seen.add(candidate)
+        result.append(candidate)
+
+    return result
+
+
+def read_and_reconcile(source):
+    """Baca file lalu selaraskan nama kolom (dipanggil di worker pool).
+
+    Mengembalikan (frame, notes): `notes` berisi penyesuaian kolom yang
+    perlu diketahui pengguna (kolom kembar, bentrok dengan `SOURCE_COL`).
+    """
+    frame = read_data_file(source)
+    columns = list(normalize_columns(frame.columns))
+    notes = []
+
+    if SOURCE_COL in columns:
+        columns = [f"{c}_asli" if c == SOURCE_COL else c for c in columns]
+        notes.append(f"kolom '{SOURCE_COL}' bawaan file diganti nama menjadi '{SOURCE_COL}_asli'")
+
+    unique = make_unique(columns)
+    renamed = [f"'{new}'" for old, new in zip(columns, unique) if old != new]
+    if renamed:
+        notes.append(f"nama kolom kembar setelah normalisasi diganti menjadi {', '.join(renamed)}")
+
+    frame.columns = unique
+    return frame, notes
+
+
+def read_and_reconcile_bytes(name, data):
+    """Versi `read_and_reconcile` untuk process pool (input berupa bytes)."""
+    buffer = io.BytesIO(data)
+    buffer.name = name
+    return read_and_reconcile(buffer)
+
+
+def file_bytes(source):
+    """Isi file sebagai bytes (upload Streamlit atau path)."""
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    return Path(source).read_bytes()
+
+
+def load_files(sources):
+    """Baca satu atau beberapa file menjadi satu DataFrame.
+
+    Beberapa file dibaca paralel, nama kolomnya diselaraskan, lalu digabung
+    sekali dengan kolom `SOURCE_COL` sebagai penanda asal data. CSV dibaca
+    di thread pool (parser C pandas melepas GIL); Excel (openpyxl, pure
+    Python) dibaca di process pool agar benar-benar paralel.
+
+    Mengembalikan (df, schema_df, read_errors, notices). `schema_df` hanya
+    terisi untuk multi-file: matriks kolom x file (True jika kolom ada di
+    file). `notices` berisi penyesuaian yang dilakukan per file.
+    """
+    df = None
+    read_errors = {}
+    schema_df = None
+    notices = []
+
+    # satu file: rekonsiliasi kolom yang sama, tanpa kolom SOURCE_COL
+    if len(sources) == 1:
+        name = str(sources[0].name)
+        try:
+            df, notes = read_and_reconcile(sources[0])
+        except Exception as e:
+            read_errors[name] = str(e)
+        else:
+            notices.extend(f"{name}: {note}." for note in notes)
+        return df, schema_df, read_errors, notices
+
+    # ===============================
+    # LABEL UNIK PER FILE
+    # ===============================
+    names = [str(f.name) for f in sources]
+    labels = [
+        name if names.count(name) == 1 else f"{name} ({names[:i + 1].count(name)})"
+        for i, name in enumerate(names)
+    ]
+    labels = make_unique(labels)
+
+    for name in dict.fromkeys(names):
+        if names.count(name) > 1:
+            notices.append(
+                f"{names.count(name)} file bernama '{name}' diberi label "
+                f"'{name} (1)', '{name} (2)', dst. di kolom '{SOURCE_COL}'."
+            )
+
+    # ===============================
+    # PARSING PARALEL (WORKER POOL)
+    # ===============================
+    frames = {}
+    futures = {}
+    excel = [i for i, name in enumerate(names) if not name.lower().endswith(".csv")]
+    workers = min(MAX_READ_WORKERS, len(sources))
+    use_processes = len(excel) > 1
+    process_pool = (
+        ProcessPoolExecutor(
+            max_workers=min(workers, len(excel)),
+            # jangan fork dari proses server Streamlit yang multi-thread
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        if use_processes else nullcontext()
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as threads, process_pool as processes:
+        for i, (label, source) in enumerate(zip(labels, sources)):
+            try:
+                if use_processes and i in excel:
+                    futures[label] = processes.submit(
+                        read_and_reconcile_bytes, names[i], file_bytes(source)
+                    )
+                else:
+                    futures[label] = threads.submit(read_and_reconcile, source)
+            except Exception as e:
+                read_errors[label] = str(e)
+
+        for label, future in futures.items():
+            try:
+                frames[label], notes = future.result()
+            except Exception as e:
+                read_errors[label] = str(e)
+                continue
+            notices.extend(f"{label}: {note}." for note in notes)
+
+    # ===============================
+    # REKONSILIASI SKEMA + KONSOLIDASI
+    # ===============================
+    if frames:
+        schema_df = pd.DataFrame({
+            label: pd.Series(True, index=frame.columns)
+            for label, frame in frames.items()
+        }).notna()
+
+        try:
+            df = pd.concat(
+                frames,
+                names=[SOURCE_COL, None],
+                sort=False
+            )
+            df = df.reset_index(level=SOURCE_COL).reset_index(drop=True)
+        except Exception as e:
+            read_errors["Konsolidasi"] = str(e)
+            df = None
+
+    return df, schema_df, read_errors, notices
+
+
+def clean_data(df, schema_df=None):
+    """Cleaning & normalisasi data keuangan (Step 2).
+
+    `schema_df` (dari `load_files`, multi-file) dipakai agar kolom yang tidak
+    dimiliki suatu file sumber dibiarkan kosong, bukan diimputasi dengan
+    nilai file lain.
+
+    Mengembalikan (df_clean, cleaning_log).
+    """
+    df_clean = df.copy()
+    cleaning_log = []
+
+    # file sumber yang tidak memiliki kolom tertentu (kolom → label file)
+    absent_sources = {}
+    if schema_df is not None and SOURCE_COL in df_clean.columns:
+        for col, present in schema_df.iterrows():
+            if not present.all():
+                absent_sources[col] = present.index[~present].tolist()
+
+    # ======================================================
+    # 1️⃣ NORMALISASI NAMA KOLOM
+    # ======================================================
+    original_columns = df_clean.columns.tolist()
+
+    df_clean.columns = normalize_columns(df_clean.columns)
+
+    if original_columns != df_clean.columns.tolist():
+        cleaning_log.append(
+            "Nama kolom dinormalisasi (lowercase, underscore, tanpa simbol)"
+        )
+
+    # ======================================================
+    # 2️⃣ HAPUS DUPLIKASI BARIS (AMAN)
+    # ======================================================
+    before_rows = df_clean.shape[0]
+    df_clean = df_clean.drop_duplicates()
+    after_rows = df_clean.shape[0]
+
+    if before_rows != after_rows:
+        cleaning_log.append(
+            f"{before_rows - after_rows} baris duplikat dihapus"
+        )
+
+    # ======================================================
+    # 3️⃣ NORMALISASI ISI DATA (FINANCE-AWARE)
+    # ======================================================
+    for col in df_clean.columns:
+
+        # kolom asal file (multi-upload) dibiarkan apa adanya
+        if col == SOURCE_COL:
+            continue
+
+        # =========================
+        # A. OBJECT / STRING
+        # =========================
+        if df_clean[col].dtype == "object":
+
+            original_non_null = df_clean[col].notna().sum()
+
+            # string dasar (AMAN)
+            series = (
+                df_clean[col]
+                .astype(str)
+                .str.strip()
+                .str.replace(r"\s+", " ", regex=True)
+            )
+
+            # -------------------------
+            # Coba konversi DATETIME
+            # -------------------------
+            converted_date = pd.to_datetime(series, errors="coerce")
+            if converted_date.notna().mean() > 0.8:
+                df_clean[col] = converted_date
+                cleaning_log.append(
+                    f"Kolom '{col}' dikonversi ke datetime"
+                )
+                continue
+
+            # -------------------------
+            # Normalisasi ANGKA KEUANGAN
+            # -------------------------
+            numeric_candidate = (
+                series
+                .str.replace(r"[^\d\-,.]", "", regex=True)  # hapus currency symbol
+                .str.replace(",", "", regex=False)          # hapus ribuan
+                .replace({"": None, "-": None})
+            )
+
+            numeric_converted = pd.to_numeric(
+                numeric_candidate, errors="coerce"
+            )
+
+            # konversi hanya jika mayoritas valid
+            if numeric_converted.notna().mean() > 0.6:
+                df_clean[col] = numeric_converted
+                cleaning_log.append(
+                    f"Kolom '{col}' dinormalisasi sebagai numerik (financial)"
+                )
+                continue
+
+            # fallback → tetap string
+            df_clean[col] = series
+
+        # =========================
+        # B. IMPUTASI MISSING VALUE
+        # =========================
+        absent = pd.Series(False, index=df_clean.index)
+        if col in absent_sources:
+            absent = df_clean[SOURCE_COL].isin(absent_sources[col])
+
+        if absent.any():
+            df_clean[col] = df_clean[col].mask(absent)
+            cleaning_log.append(
+                f"Kolom '{col}' tidak ada di file {', '.join(absent_sources[col])}: "
+                f"{absent.sum()} baris dibiarkan kosong (tidak diimputasi)"
+            )
+
+        missing = (df_clean[col].isnull() & ~absent).sum()
+
+        if missing > 0:
+            if pd.api.types.is_numeric_dtype(df_clean[col]):
+                median = df_clean[col].median()
+                df_clean[col] = df_clean[col].where(absent, df_clean[col].fillna(median))
+                cleaning_log.append(
+                    f"Kolom '{col}' (numerik): {missing} missing → median"
+                )
+            else:
+                mode = df_clean[col].mode()
+                fill_value = mode[0] if not mode.empty else "Unknown"
+                df_clean[col] = df_clean[col].where(absent, df_clean[col].fillna(fill_value))
+                cleaning_log.append(
+                    f"Kolom '{col}' (kategori): {missing} missing → '{fill_value}'"
+                )
+
+    return df_clean, cleaning_log
+
+
+def detect_column_roles(df):
+    """Kelompokkan kolom menjadi (tanggal, numerik, kategori)."""
+    date_cols, numeric_cols, categorical_cols = [], [], []
+
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            date_cols.append(col)
+        elif pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+            numeric_cols.append(col)
+        else:
+            categorical_cols.append(col)
+
+    return date_cols, numeric_cols, categorical_cols
+
+
+def assess_quality(df, categorical_cols):
+    """Tabel kualitas per kolom: missing rate, unique ratio, dan status."""
+    total_rows = len(df)
+    quality_table = []
+
+    for col in df.columns:
+        missing_rate = df[col].isnull().mean()
+        unique_ratio = df[col].nunique(dropna=True) / total_rows
+
+        status = "Aman"
+
+        if missing_rate > 0.30:
+            status = "Missing Tinggi"
+        elif unique_ratio < 0.05 and col in categorical_cols and col != SOURCE_COL:
+            status = "Variasi Rendah"
+
+        quality_table.append({
+            "Kolom": col,
+            "Missing (%)": round(missing_rate * 100, 2),
+            "Unique Ratio": round(unique_ratio, 3),
+            "Status": status
+        })
+
+    return pd.DataFrame(quality_table)
+
+
+def build_kpi_panel(df, date_col, kpi_cols, segment_col=None):
+    """Agregasi bulanan semua KPI (dan segmen) ke tabel lebar.
+
+    Baris = periode (bulanan, tanpa bolong), kolom = (kpi, segmen).
+    Segmen `TOTAL_SEGMENT` selalu ada sebagai agregat seluruh data; nilai
+    segmen asli diberi awalan "<kolom>=" sehingga tidak pernah bentrok
+    dengannya (mis. ekspor ERP yang punya baris kategori "Total").
+    """
+    period = df[date_col].dt.to_period("M").dt.to_timestamp().rename("period")
+
+    total = df.groupby(period)[kpi_cols].sum()
+    total.columns = pd.MultiIndex.from_product([total.columns, [TOTAL_SEGMENT]])
+    parts = [total]
+
+    if segment_col is not None:
+        segment = (f"{segment_col}=" + df[segment_col].astype(str)).rename("segment")
+        by_segment = df.groupby([period, segment])[kpi_cols].sum().unstack("segment")
+        parts.append(by_segment)
+
+    panel = pd.concat(parts, axis=1).sort_index(axis=1)
+    panel.columns.names = ["kpi", "segment"]
+    return panel.sort_index().asfreq("MS").astype(float)
+
+
+def rolling_median_mad(panel, window, min_periods):
+    """Median & MAD rolling untuk semua kolom sekaligus (tanpa loop per seri)."""
+    values = panel.to_numpy()
+    padded = np.vstack([np.full((window - 1, values.shape[1]), np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=0)
+    enough = (~np.isnan(windows)).sum(axis=2) >= min_periods
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        median = np.nanmedian(windows, axis=2)
+        mad = np.nanmedian(np.abs(windows - median[..., None]), axis=2)
+
+    median[~enough] = np.nan
+    mad[~enough] = np.nan
+    return (
+        pd.DataFrame(median, index=panel.index, columns=panel.columns),
+        pd.DataFrame(mad, index=panel.index, columns=panel.columns),
+    )
+
+
+def detect_anomalies(panel, window=ANOMALY_WINDOW, threshold=ANOMALY_THRESHOLD, season=SEASON_LENGTH):
+    """Deteksi anomali untuk semua seri (kolom panel) sekaligus secara vektor.
+
+    - Robust z-score: jarak dari median rolling periode sebelumnya, diskalakan MAD.
+    - Change-point: beda rata-rata jendela sesudah vs sebelum (puncak lokal saja).
+    - Musiman: selisih terhadap median bulan yang sama di tahun-tahun sebelumnya
+      (tanpa titik yang sudah ditandai; jika data >= 2 tahun).
+
+    Hasil berupa tabel panjang, satu baris per (periode, seri, metode) yang ditandai.
+    """
+    min_periods = max(3, window // 2)
+    history = panel.shift(1)
+
+    # 1. robust z-score (median / MAD rolling)
+    # skala = MAD lokal, minimal MAD residual seluruh seri (jendela pendek terlalu "sempit")
+    median, mad = rolling_median_mad(history, window, min_periods)
+    resid = panel - median
+    spread = 1.4826 * (resid - resid.median()).abs().median()
+    scale = (1.4826 * mad).clip(lower=spread, axis=1)
+    scale = np.maximum(scale, 0.01 * median.abs()).replace(0, np.nan)
+    robust_z = resid / scale
+
+    # 2. change-point (level shift)
+    before = history.rolling(window, min_periods=min_periods)
+    after = panel.rolling(
+        pd.api.indexers.FixedForwardWindowIndexer(window_size=window),
+        min_periods=min_periods
+    )
+    before_mean = before.mean()
+    pooled_std = np.sqrt((before.var() + after.var()) / 2)
+    pooled_std = np.maximum(pooled_std, 0.01 * before_mean.abs()).replace(0, np.nan)
+    shift_score = (after.mean() - before_mean) / pooled_std
+    shift_abs = shift_score.abs()
+    is_peak = shift_abs == shift_abs.rolling(window, center=True, min_periods=1).max()
+
+    scores = {
+        "Robust Z (MAD)": robust_z,
+        "Change-Point": shift_score.where(is_peak),
+    }
+
+    # 3. baseline musiman
+    # baseline = median bulan yang sama di tahun-tahun sebelumnya, tanpa titik
+    # yang sudah ditandai robust z (agar lonjakan tidak "bergema" 12 bulan kemudian)
+    if len(panel) >= 2 * season:
+        clean_history = panel.mask(robust_z.abs() > threshold)
+        lagged = np.stack([
+            clean_history.shift(season * k).to_numpy()
+            for k in range(1, (len(panel) - 1) // season + 1)
+        ])
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            baseline = np.nanmedian(lagged, axis=0)
+
+        seasonal_diff = panel - baseline
+        center = seasonal_diff.median()
+        spread = (1.4826 * (seasonal_diff - center).abs().median()).replace(0, np.nan)
+        scores["Musiman"] = (seasonal_diff - center) / spread
+
+    values = panel.to_numpy()
+    kpis = panel.columns.get_level_values("kpi")
+    segments = panel.columns.get_level_values("segment")
+    flagged = []
+
+    for method, score in scores.items():
+        score_values = score.to_numpy()
+        with np.errstate(invalid="ignore"):
+            rows, cols = np.nonzero(np.abs(score_values) > threshold)
+        flagged.append(pd.DataFrame({
+            "Periode": panel.index[rows],
+            "KPI": kpis[cols],
+            "Segmen": segments[cols],
+            "Metode": method,
+            "Nilai": values[rows, cols],
+            "Skor": score_values[rows, cols].round(2),
+            "Arah": np.where(score_values[rows, cols] > 0, "Lonjakan", "Penurunan"),
+        }))
+
+    return (
+        pd.concat(flagged, ignore_index=True)
+        .sort_values(["Periode", "KPI", "Segmen"], ascending=[False, True, True])
+        .reset_index(drop=True)
+    )
+
+
+def fit_linear_trend(values, horizon):
+    """Tren linier (least squares closed-form) per kolom; NaN diabaikan."""
+    t = np.arange(len(values), dtype=float)[:, None]
+    weight = ~np.isnan(values)
+    y = np.where(weight, values, 0.0)
+
+    n = weight.sum(axis=0)
+    sum_t = (weight * t).sum(axis=0)
+    sum_tt = (weight * t * t).sum(axis=0)
+    sum_y = y.sum(axis=0)
+    sum_ty = (t * y).sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = n * sum_tt - sum_t ** 2
+        slope = np.where(denom > 0, (n * sum_ty - sum_t * sum_y) / denom, 0.0)
+        intercept = (sum_y - slope * sum_t) / n
+
+    resid = np.where(weight, values - (intercept + slope * t), np.nan)
+    future_t = np.arange(len(values), len(values) + horizon, dtype=float)[:, None]
+    return intercept + slope * future_t, resid
+
+
+def fit_exponential_smoothing(values, horizon, alphas=FORECAST_ALPHAS):
+    """Simple exponential smoothing; alpha dipilih per kolom dari grid (SSE terkecil)."""
+    best_level = np.full(values.shape[1], np.nan)
+    best_resid = np.full(values.shape, np.nan)
+    best_sse = np.full(values.shape[1], np.inf)
+
+    for alpha in alphas:
+        level = np.full(values.shape[1], np.nan)
+        resid = np.full(values.shape, np.nan)
+
+        for t, x in enumerate(values):
+            resid[t] = x - level
+            updated = np.where(np.isnan(x), level, level + alpha * (x - level))
+            level = np.where(np.isnan(level), x, updated)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            sse = np.nanmean(resid ** 2, axis=0)
+        better = sse < best_sse
+        best_sse = np.where(better, sse, best_sse)
+        best_level = np.where(better, level, best_level)
+        best_resid[:, better] = resid[:, better]
+
+    return np.tile(best_level, (horizon, 1)), best_resid
+
+
+def fit_seasonal_naive(values, horizon, season=SEASON_LENGTH):
+    """Seasonal naive: nilai periode yang sama musim sebelumnya."""
+    if len(values) < season:
+        return np.full((horizon, values.shape[1]), np.nan), np.full(values.shape, np.nan)
+
+    steps = np.arange(horizon) % season
+    forecast = values[len(values) - season + steps]
+    resid = np.full(values.shape, np.nan)
+    resid[season:] = values[season:] - values[:-season]
+    return forecast, resid
+
+
+FORECAST_MODELS = {
+    "Exponential Smoothing": fit_exponential_smoothing,
+    "Tren Linier": fit_linear_trend,
+    "Seasonal Naive": fit_seasonal_naive,
+}
+
+
+def forecast_panel(panel, horizon=FORECAST_HORIZON):
+    """Proyeksi batch untuk semua seri (kolom panel) sekaligus.
+
+    Model dipilih per seri berdasarkan error backtest pada `horizon` periode
+    terakhir, lalu di-fit ulang pada seluruh data. Pita ketidakpastian
+    ±1.28·σ·√h (≈80%), σ dari residual in-sample model terpilih.
+
+    Mengembalikan (proyeksi, batas_bawah, batas_atas, ringkasan):
+    tiga tabel lebar per periode mendatang dan satu baris ringkasan per seri.
+    "Growth Proyeksi (%)" bernilai NaN jika riwayat belum cukup.
+    """
+    values = panel.interpolate(limit_area="inside").to_numpy()
+    names = list(FORECAST_MODELS)
+
+    # backtest: fit tanpa `horizon` periode terakhir, ukur MAE
+    train, test = values[:-horizon], values[-horizon:]
+    errors = np.full((len(names), values.shape[1]), np.inf)
+
+    if len(train) >= 3:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            for i, fit in enumerate(FORECAST_MODELS.values()):
+                predicted, _ = fit(train, horizon)
+                mae = np.nanmean(np.abs(predicted - test), axis=0)
+                errors[i] = np.where(np.isnan(mae), np.inf, mae)
+
+    best = errors.argmin(axis=0)
+    columns = np.arange(values.shape[1])
+
+    # fit ulang pada seluruh data, ambil model terbaik per seri
+    forecasts, sigmas = [], []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        for fit in FORECAST_MODELS.values():
+            predicted, resid = fit(values, horizon)
+            forecasts.append(predicted)
+            sigmas.append(np.nanstd(resid, axis=0))
+
+    forecast = np.stack(forecasts)[best, :, columns].T
+    sigma = np.nan_to_num(np.stack(sigmas)[best, columns])
+    band = FORECAST_BAND_Z * sigma * np.sqrt(np.arange(1, horizon + 1))[:, None]
+
+    future = pd.date_range(
+        panel.index[-1] + pd.offsets.MonthBegin(1), periods=horizon, freq="MS"
+    )
+    frame_kwargs = dict(index=future, columns=panel.columns)
+
+    # baseline aktual dari panel mentah (tanpa interpolasi); growth dibandingkan
+    # per periode, dan NaN jika riwayat asli kurang dari `horizon` periode
+    actual = panel.to_numpy()[-horizon:]
+    actual_count = (~np.isnan(actual)).sum(axis=0)
+    last_total = np.nansum(actual, axis=0)
+    projected_total = forecast.sum(axis=0)
+    enough_history = panel.notna().sum().to_numpy() >= horizon
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        last_mean = last_total / actual_count
+        projected_mean = projected_total / horizon
+        growth = np.where(
+            enough_history & (actual_count > 0) & (last_mean != 0),
+            (projected_mean - last_mean) / np.abs(last_mean) * 100,
+            np.nan
+        )
+
+    summary = pd.DataFrame({
+        "Model": np.array(names)[best],
+        f"Aktual {horizon} Periode Terakhir": last_total,
+        f"Proyeksi {horizon} Periode": projected_total,
+        "Batas Bawah": projected_total - np.sqrt((band ** 2).sum(axis=0)),
+        "Batas Atas": projected_total + np.sqrt((band ** 2).sum(axis=0)),
+        "Growth Proyeksi (%)": np.round(growth, 2),
+    }, index=panel.columns)
+
+    return (
+        pd.DataFrame(forecast, **frame_kwargs),
+        pd.DataFrame(forecast - band, **frame_kwargs),
+        pd.DataFrame(forecast + band, **frame_kwargs),
+        summary,
+    )
+
+
+def run_pipeline(sources):
+    """Jalankan ingest, cleaning, profiling, dan agregasi KPI tanpa UI.
+
+    Hasilnya adalah isi snapshot yang bisa langsung dibuka oleh aplikasi.
+    """
+    raw_data, schema_df, read_errors, notices = load_files(sources)
+    if raw_data is None:
+        raise ValueError(f"File gagal dibaca: {read_errors}")
+
+    clean, cleaning_log = clean_data(raw_data, schema_df)
+    date_cols, _, categorical_cols = detect_column_roles(clean)
+    kpi_cols = [c for c in clean.columns if pd.api.types.is_numeric_dtype(clean[c])]
+
+    return {
+        "raw_data": raw_data,
+        "schema": schema_df,
+        "read_errors": read_errors,
+        "notices": notices,
+        "clean_data": clean,
+        "cleaning_log": cleaning_log,
+        "quality": assess_quality(clean, categorical_cols),
+        "kpi_panels": {
+            date_col: build_kpi_panel(clean, date_col, kpi_cols)
+            for date_col in date_cols
+        } if kpi_cols else {},
+    }
+
+
+def save_snapshot(snapshot, name, signatures, snapshot_dir=SNAPSHOT_DIR, watch_dir=None, mode=None):
+    """Simpan snapshot (.pkl) + metadata (.json) secara atomik.
+
+    `signatures` adalah `file_signature` tiap file sumber, diambil sebelum
+    diproses. `watch_dir` & `mode` mencatat asal snapshot agar bisa dicek
+    kesegarannya dan dibersihkan. Metadata ditulis terakhir, sehingga
+    snapshot hanya muncul di daftar aplikasi setelah file datanya lengkap.
+    """
+    snapshot_dir = Path(snapshot_dir)
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+    meta = {
+        "name": name,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "sources": signatures,
+        "rows": int(snapshot["clean_data"].shape[0]),
+        "columns": int(snapshot["clean_data"].shape[1]),
+        "size": sum(s["size"] for s in signatures),
+        "watch_dir": str(Path(watch_dir).resolve()) if watch_dir is not None else None,
+        "mode": mode,
+    }
+
+    data_path = snapshot_dir / f"{name}.pkl"
+    meta_path = snapshot_dir / f"{name}.json"
+
+    pd.to_pickle(snapshot, f"{data_path}.tmp")
+    os.replace(f"{data_path}.tmp", data_path)
+
+    with open(f"{meta_path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(f"{meta_path}.tmp", meta_path)
+
+    return meta
+
+
+def list_snapshots(snapshot_dir=SNAPSHOT_DIR):
+    """Daftar metadata snapshot, terbaru lebih dulu."""
+    metas = []
+
+    for meta_path in Path(snapshot_dir).glob("*.json"):
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                metas.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+
+    return sorted(metas, key=lambda m: m["created_at"], reverse=True)
+
+
+def load_snapshot(name, snapshot_dir=SNAPSHOT_DIR):
+    """Buka isi snapshot yang sudah diproses."""
+    return pd.read_pickle(Path(snapshot_dir) / f"{name}.pkl")
+
+
+def delete_snapshot(name, snapshot_dir=SNAPSHOT_DIR):
+    """Hapus snapshot (metadata lebih dulu agar langsung hilang dari daftar)."""
+    for suffix in (".json", ".pkl"):
+        (Path(snapshot_dir) / f"{name}{suffix}").unlink(missing_ok=True)
+
+
+def snapshot_is_current(meta):
+    """True jika semua file sumber snapshot masih ada dan belum berubah.
+
+    Snapshot tanpa `watch_dir` (dibuat di luar watcher) dianggap current.
+    """
+    if not meta.get("watch_dir"):
+        return True
+
+    for source in meta["sources"]:
+        try:
+            if file_signature(Path(meta["watch_dir"]) / source["file"]) != source:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def file_signature(path):
+    """Identitas versi file (ukuran + waktu ubah) untuk deteksi perubahan."""
+    stat = path.stat()
+    return {"file": path.name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
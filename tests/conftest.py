@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# modul aplikasi (pipeline.py) berada di root repo, bukan paket terinstal
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
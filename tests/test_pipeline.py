@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from pipeline import (
+    FORECAST_HORIZON,
+    TOTAL_SEGMENT,
+    build_kpi_panel,
+    detect_anomalies,
+    forecast_panel,
+)
+
+
+def monthly_frame(values, start="2021-01-01", **extra):
+    return pd.DataFrame({
+        "tanggal": pd.date_range(start, periods=len(values), freq="MS"),
+        "sales": values,
+        **extra,
+    })
+
+
+def test_segment_named_total_does_not_collide_with_total_key():
+    df = pd.concat([
+        monthly_frame([1.0, 2.0, 3.0], segmen="Total"),
+        monthly_frame([10.0, 20.0, 30.0], segmen="A"),
+    ])
+
+    panel = build_kpi_panel(df, "tanggal", ["sales"], "segmen")
+
+    assert panel.columns.is_unique
+    assert list(panel[("sales", TOTAL_SEGMENT)]) == [11.0, 22.0, 33.0]
+    assert list(panel[("sales", "segmen=Total")]) == [1.0, 2.0, 3.0]
+
+
+def test_spike_is_flagged_without_seasonal_echo():
+    rng = np.random.default_rng(0)
+    values = 1000 + rng.normal(0, 5, 36)
+    values[18] = 3000  # 2022-07
+
+    panel = build_kpi_panel(monthly_frame(values), "tanggal", ["sales"])
+    anomalies = detect_anomalies(panel)
+    flagged = set(anomalies["Periode"])
+
+    assert pd.Timestamp("2022-07-01") in flagged
+    assert pd.Timestamp("2023-07-01") not in flagged
+
+
+def test_growth_is_nan_below_forecast_horizon():
+    values = [100.0] * (FORECAST_HORIZON - 1)
+    panel = build_kpi_panel(monthly_frame(values), "tanggal", ["sales"])
+
+    summary = forecast_panel(panel)[3]
+
+    assert np.isnan(summary.loc[("sales", TOTAL_SEGMENT), "Growth Proyeksi (%)"])
+
+
+def test_growth_uses_real_periods_not_interpolated_gaps():
+    values = [1.0, 1.0, 1.0, 1.0, np.nan, 2.0, np.nan, 3.0]
+    panel = build_kpi_panel(monthly_frame(values).dropna(), "tanggal", ["sales"])
+
+    summary = forecast_panel(panel)[3].loc[("sales", TOTAL_SEGMENT)]
+
+    assert summary[f"Aktual {FORECAST_HORIZON} Periode Terakhir"] == 5.0
+    assert np.isfinite(summary["Growth Proyeksi (%)"])
@@ -0,0 +1,183 @@
+"""Layanan precompute: pantau folder ekspor ERP dan siapkan snapshot dashboard.
+
+File CSV/Excel baru atau berubah di folder pantauan diproses (ingest, cleaning,
+profiling, agregasi KPI) lalu disimpan sebagai snapshot yang bisa langsung
+dibuka di aplikasi tanpa upload ulang.
+
+Contoh:
+    python watcher.py --watch-dir exports                # pantau terus, cek tiap 60 detik
+    python watcher.py --watch-dir exports --combine      # semua file -> satu snapshot konsolidasi
+    python watcher.py --watch-dir exports --once         # sekali jalan (untuk cron / Task Scheduler)
+"""
+import argparse
+import hashlib
+import logging
+import os
+import time
+from pathlib import Path
+
+from pipeline import (
+    SNAPSHOT_DIR,
+    delete_snapshot,
+    file_signature,
+    list_snapshots,
+    run_pipeline,
+    save_snapshot,
+)
+
+WATCH_DIR = os.environ.get("EDI_WATCH_DIR", "exports")
+SUPPORTED_SUFFIXES = (".csv", ".xlsx")
+POLL_INTERVAL = 60
+SETTLE_SECONDS = 30
+
+log = logging.getLogger("watcher")
+
+
+def find_sources(watch_dir, settle=SETTLE_SECONDS):
+    """File CSV/Excel yang sudah selesai ditulis (tidak berubah selama `settle` detik).
+
+    File yang hilang/di-rename di tengah pengecekan (pola tulis-temp-lalu-rename
+    ekspor ERP) dilewati, akan terdeteksi lagi di putaran berikutnya.
+    """
+    now = time.time()
+    sources = []
+
+    for p in Path(watch_dir).iterdir():
+        if p.suffix.lower() not in SUPPORTED_SUFFIXES or p.name.startswith(("~$", ".")):
+            continue
+        try:
+            if p.is_file() and now - p.stat().st_mtime >= settle:
+                sources.append(p)
+        except OSError:
+            continue
+
+    return sorted(sources)
+
+
+def snapshot_prefix(watch_dir):
+    """Awalan nama snapshot unik per folder: "<nama folder>-<hash path>"."""
+    resolved = Path(watch_dir).resolve()
+    digest = hashlib.sha1(str(resolved).encode("utf-8")).hexdigest()[:8]
+    return f"{resolved.name}-{digest}"
+
+
+def plan_jobs(sources, watch_dir, combine=False):
+    """Daftar (nama snapshot, file sumber): satu per file, atau satu gabungan.
+
+    Nama per-file ("<awalan>__<file>") dan gabungan ("<awalan>") tidak pernah
+    sama, sehingga watcher per-file dan --combine pada folder yang sama bisa
+    berjalan berdampingan.
+    """
+    prefix = snapshot_prefix(watch_dir)
+    if combine:
+        return [(prefix, sources)] if sources else []
+    return [(f"{prefix}__{p.name}", [p]) for p in sources]
+
+
+def own_snapshots(watch_dir, snapshot_dir, mode):
+    """Metadata snapshot milik folder & mode ini saja."""
+    watch_dir = str(Path(watch_dir).resolve())
+    return [
+        m for m in list_snapshots(snapshot_dir)
+        if m.get("watch_dir") == watch_dir and m.get("mode") == mode
+    ]
+
+
+def prune_snapshots(watch_dir, snapshot_dir, combine=False):
+    """Hapus snapshot folder & mode ini yang file sumbernya sudah tidak ada.
+
+    Snapshot folder lain, atau mode lain pada folder yang sama, tidak disentuh.
+    """
+    expected = {
+        name for name, _ in plan_jobs(find_sources(watch_dir, settle=0), watch_dir, combine)
+    }
+    mode = "combine" if combine else "per-file"
+
+    for meta in own_snapshots(watch_dir, snapshot_dir, mode):
+        if meta["name"] not in expected:
+            delete_snapshot(meta["name"], snapshot_dir)
+            log.info("Snapshot '%s' dihapus (file sumber sudah tidak ada)", meta["name"])
+
+
+def run_once(watch_dir, snapshot_dir, combine=False, settle=SETTLE_SECONDS, failed=None):
+    """Satu putaran pengecekan. Mengembalikan jumlah snapshot yang diperbarui.
+
+    Snapshot dilewati jika file sumbernya tidak berubah sejak diproses.
+    `failed` (opsional) mengingat file yang gagal agar tidak dicoba ulang
+    terus-menerus sampai file tersebut berubah.
+    """
+    failed = {} if failed is None else failed
+    mode = "combine" if combine else "per-file"
+
+    prune_snapshots(watch_dir, snapshot_dir, combine)
+    processed = {
+        m["name"]: m["sources"] for m in own_snapshots(watch_dir, snapshot_dir, mode)
+    }
+    updated = 0
+
+    for name, sources in plan_jobs(find_sources(watch_dir, settle), watch_dir, combine):
+        started = time.perf_counter()
+        signatures = None
+        try:
+            signatures = [file_signature(p) for p in sources]
+            if processed.get(name) == signatures or failed.get(name) == signatures:
+                continue
+
+            snapshot = run_pipeline(sources)
+            save_snapshot(snapshot, name, signatures, snapshot_dir, watch_dir, mode)
+        except Exception:
+            log.exception("Snapshot '%s' gagal diproses", name)
+            if signatures is not None:
+                failed[name] = signatures
+            continue
+
+        failed.pop(name, None)
+        updated += 1
+        log.info(
+            "Snapshot '%s' siap: %d file, %d baris (%.1f detik)",
+            name, len(sources), snapshot["clean_data"].shape[0],
+            time.perf_counter() - started
+        )
+
+    return updated
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompute snapshot Enterprise Data Insight dari folder ekspor ERP."
+    )
+    parser.add_argument("--watch-dir", default=WATCH_DIR,
+                        help="folder yang dipantau (default: $EDI_WATCH_DIR atau 'exports')")
+    parser.add_argument("--snapshot-dir", default=SNAPSHOT_DIR,
+                        help="folder snapshot (default: $EDI_SNAPSHOT_DIR atau 'snapshots')")
+    parser.add_argument("--interval", type=int, default=POLL_INTERVAL,
+                        help="jeda antar pengecekan dalam detik")
+    parser.add_argument("--settle", type=int, default=SETTLE_SECONDS,
+                        help="file dianggap selesai ditulis jika tidak berubah selama N detik")
+    parser.add_argument("--combine", action="store_true",
+                        help="gabungkan semua file di folder menjadi satu snapshot")
+    parser.add_argument("--once", action="store_true",
+                        help="proses sekali lalu keluar")
+    args = parser.parse_args()
+
+    if not Path(args.watch_dir).is_dir():
+        parser.error(f"folder pantauan tidak ditemukan: {args.watch_dir}")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    log.info("Memantau '%s' → snapshot di '%s'", args.watch_dir, args.snapshot_dir)
+
+    failed = {}
+    while True:
+        # satu putaran gagal (folder sementara tak terjangkau, disk penuh, ...)
+        # tidak boleh menghentikan layanan
+        try:
+            run_once(args.watch_dir, args.snapshot_dir, args.combine, args.settle, failed)
+        except Exception:
+            log.exception("Putaran pengecekan gagal, dicoba lagi dalam %d detik", args.interval)
+        if args.once:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()